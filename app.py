@@ -3,13 +3,17 @@ VocalLabs Backend API - Rebuilt Architecture
 A modern speech analysis and feedback system for public speaking improvement
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import logging
 import os
+import uuid
+import hashlib
+import orjson
 from datetime import datetime
 import asyncio
 from contextlib import asynccontextmanager
@@ -22,6 +26,7 @@ from services.auth_service import AuthService
 from config.settings import Settings
 from utils.logger import setup_logger
 from utils.exceptions import VocalLabsException, AudioProcessingError, AnalysisError
+from utils.cache import AnalysisCache
 
 # Setup
 settings = Settings()
@@ -39,6 +44,13 @@ async def lifespan(app: FastAPI):
     app.state.storage_service = StorageService()
     app.state.auth_service = AuthService()
     
+    # Results of recent quick analyses, keyed on audio content
+    app.state.quick_analysis_cache = AnalysisCache(max_entries=128)
+    
+    # History pages, keyed on (user_id, limit, offset); saves and deletes
+    # drop the user's pages, otherwise they're refetched after 60 seconds
+    app.state.history_cache = AnalysisCache(max_entries=10000, ttl=60)
+    
     # Download required models
     await app.state.speech_service.initialize()
     
@@ -55,7 +67,8 @@ app = FastAPI(
     title="VocalLabs API",
     description="Advanced Speech Analysis and Feedback System",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -97,6 +110,56 @@ class HealthCheck(BaseModel):
     timestamp: datetime
     services: Dict[str, str]
 
+# =====================
+# Helpers
+# =====================
+
+def make_etag(payload: Any) -> str:
+    """Strong ETag for a JSON-serializable payload"""
+    return f'"{hashlib.md5(orjson.dumps(payload)).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+async def forget_user_history(user_id: str):
+    """Drop cached history pages for a user after their analyses change"""
+    history_cache: AnalysisCache = app.state.history_cache
+    history_cache.invalidate(lambda key: key[0] == user_id)
+
+async def persist_analysis(
+    analysis_id: str,
+    user_id: str,
+    speech_title: Optional[str],
+    results: Dict[str, Any]
+):
+    """
+    Save analysis results in the background.
+
+    Never raises, so background tasks queued after it still run. On failure
+    the analysis is stored with status "failed" so clients polling
+    /api/v2/analysis/{analysis_id} see the error instead of a 404.
+    """
+    storage_service: StorageService = app.state.storage_service
+    try:
+        await storage_service.save_analysis(
+            user_id=user_id,
+            speech_title=speech_title,
+            results=results,
+            analysis_id=analysis_id
+        )
+    except Exception as e:
+        logger.error(f"Background save failed for {analysis_id}: {e}")
+        try:
+            await storage_service.mark_analysis_failed(analysis_id, user_id, str(e))
+        except Exception as e:
+            logger.error(f"Could not record failed save for {analysis_id}: {e}")
+    finally:
+        await forget_user_history(user_id)
+
 # =====================
 # API Endpoints
 # =====================
@@ -177,7 +240,6 @@ async def analyze_speech(
         # Get services
         speech_service: SpeechAnalysisService = app.state.speech_service
         audio_service: AudioProcessingService = app.state.audio_service
-        storage_service: StorageService = app.state.storage_service
         
         # Process audio file
         audio_path = await audio_service.save_upload(audio_file, user_id)
@@ -194,21 +256,27 @@ async def analyze_speech(
         # Calculate processing time
         processing_time = (datetime.now() - analysis_start_time).total_seconds()
         
-        # Save results to storage
-        analysis_id = await storage_service.save_analysis(
+        # Schedule cleanup first so it runs whatever happens to the save
+        background_tasks.add_task(audio_service.cleanup_file, audio_path)
+        
+        # Save results to storage after the response is sent; the client
+        # gets the ID now and can fetch the stored analysis once it's written
+        # (its "status" is "saved", or "failed" if the write didn't go through)
+        analysis_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            persist_analysis,
+            analysis_id=analysis_id,
             user_id=user_id,
             speech_title=speech_title,
             results=analysis_results
         )
         
-        # Schedule cleanup
-        background_tasks.add_task(audio_service.cleanup_file, audio_path)
-        
         logger.info(f"Analysis completed in {processing_time:.2f}s")
         
         return {
             "analysis_id": analysis_id,
             "status": "completed",
+            "storage_status": "pending",
             "scores": analysis_results.get("scores", {}),
             "transcription": analysis_results.get("transcription", ""),
             "detailed_analysis": analysis_results.get("detailed_analysis", {}),
@@ -246,21 +314,37 @@ async def get_analysis(analysis_id: str, user_id: str):
 @app.get("/api/v2/history/{user_id}", tags=["Analysis"])
 async def get_user_history(
     user_id: str,
+    request: Request,
     limit: int = 20,
     offset: int = 0
 ):
     """
     Get analysis history for a user
+    
+    Responses carry an ETag; send it back in If-None-Match to get
+    304 Not Modified while the history is unchanged.
     """
     try:
         storage_service: StorageService = app.state.storage_service
-        history = await storage_service.get_user_history(user_id, limit, offset)
+        history_cache: AnalysisCache = app.state.history_cache
         
-        return {
+        # Concurrent misses for the same page share one Firestore query
+        history = await history_cache.get_or_compute(
+            (user_id, limit, offset),
+            lambda: storage_service.get_user_history(user_id, limit, offset)
+        )
+        
+        payload = jsonable_encoder({
             "user_id": user_id,
             "total": len(history),
             "analyses": history
-        }
+        })
+        etag = make_etag(payload)
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        return ORJSONResponse(content=payload, headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Error retrieving history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -277,6 +361,8 @@ async def delete_analysis(analysis_id: str, user_id: str):
         if not success:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
+        await forget_user_history(user_id)
+        
         return {"message": "Analysis deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting analysis: {e}")
@@ -301,9 +387,15 @@ async def quick_analyze(
         speech_service: SpeechAnalysisService = app.state.speech_service
         audio_service: AudioProcessingService = app.state.audio_service
         
-        # Process
+        quick_analysis_cache: AnalysisCache = app.state.quick_analysis_cache
+        
+        # Process (identical audio reuses the previous result)
         audio_path = await audio_service.save_upload(audio_file, "quick_analysis")
-        results = await speech_service.analyze(audio_path, analysis_depth="basic")
+        cache_key = (await audio_service.content_digest(audio_path), settings.DEFAULT_MODEL)
+        results = await quick_analysis_cache.get_or_compute(
+            cache_key,
+            lambda: speech_service.analyze(audio_path, analysis_depth="basic")
+        )
         
         # Cleanup
         background_tasks.add_task(audio_service.cleanup_file, audio_path)
@@ -325,7 +417,7 @@ async def quick_analyze(
 @app.exception_handler(VocalLabsException)
 async def vocallabs_exception_handler(request, exc: VocalLabsException):
     """Handle custom VocalLabs exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.message, "details": exc.details}
     )
@@ -334,7 +426,7 @@ async def vocallabs_exception_handler(request, exc: VocalLabsException):
 async def general_exception_handler(request, exc: Exception):
     """Handle general exceptions"""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error", "details": str(exc)}
     )
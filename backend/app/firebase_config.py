@@ -1,44 +1,89 @@
 # File: backend/app/firebase_config.py
 import os
-from firebase_admin import credentials, firestore, storage
+import itertools
+from functools import lru_cache
+from firebase_admin import credentials, storage
+from google.cloud import firestore as gcloud_firestore
 import firebase_admin
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Get environment variables
-private_key = os.getenv("FIREBASE_PRIVATE_KEY")
-private_key_id = os.getenv("FIREBASE_PRIVATE_KEY_ID")
-
-# Check if credentials exist
-if not private_key or not private_key_id:
-    raise RuntimeError("FIREBASE_PRIVATE_KEY or FIREBASE_PRIVATE_KEY_ID is not set in the environment variables")
-
-# Replace escaped newlines with actual newlines in the private key
-private_key = private_key.replace("\\n", "\n")
-
-# Firebase service account key configuration
-service_account_key = {
-    "type": "service_account",
-    "project_id": "speak-sharp-6bd84",
-    "private_key_id": private_key_id,
-    "private_key": private_key,
-    "client_email": "firebase-adminsdk-fbsvc@speak-sharp-6bd84.iam.gserviceaccount.com",
-    "client_id": "107155883031098895083",
-    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-    "token_uri": "https://oauth2.googleapis.com/token",
-    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-    "client_x509_cert_url": "https://www.googleapis.com/robot/v1/metadata/x509/firebase-adminsdk-fbsvc%40speak-sharp-6bd84.iam.gserviceaccount.com",
-    "universe_domain": "googleapis.com"
-}
-
-# Initialize Firebase
-cred = credentials.Certificate(service_account_key)
-
-firebase_admin.initialize_app(cred, {
-    'storageBucket': 'speak-sharp-6bd84.firebasestorage.app'
-})
-
-# Create database instance
-db = firestore.client()
\ No newline at end of file
+# Number of Firestore clients in the pool. Each client has its own gRPC
+# channel, so spreading requests over several avoids queueing on one channel.
+# Clients are thread-safe, so the pool is shared by the whole process.
+FS_POOL_SIZE = int(os.getenv("FS_POOL", "4"))
+
+_next_client = itertools.cycle(range(FS_POOL_SIZE))
+
+@lru_cache(maxsize=None)
+def _init_firebase():
+    """
+    Initialize Firebase on first use.
+
+    Credentials are only read and parsed when something actually needs
+    Firebase, so importing this module has no side effects.
+
+    Returns:
+        Tuple: (firebase app, list of Firestore clients)
+    """
+    # Get environment variables (never hard-code the key here)
+    private_key = os.environ.get("FIREBASE_PRIVATE_KEY")
+    private_key_id = os.environ.get("FIREBASE_PRIVATE_KEY_ID")
+
+    # Check if credentials exist
+    if not private_key or not private_key_id:
+        raise RuntimeError("FIREBASE_PRIVATE_KEY or FIREBASE_PRIVATE_KEY_ID is not set in the environment variables")
+
+    # Replace escaped newlines with actual newlines in the private key
+    private_key = private_key.replace("\\n", "\n")
+
+    # Firebase service account key configuration
+    service_account_key = {
+        "type": "service_account",
+        "project_id": "speak-sharp-6bd84",
+        "private_key_id": private_key_id,
+        "private_key": private_key,
+        "client_email": "firebase-adminsdk-fbsvc@speak-sharp-6bd84.iam.gserviceaccount.com",
+        "client_id": "107155883031098895083",
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+        "client_x509_cert_url": "https://www.googleapis.com/robot/v1/metadata/x509/firebase-adminsdk-fbsvc%40speak-sharp-6bd84.iam.gserviceaccount.com",
+        "universe_domain": "googleapis.com"
+    }
+
+    cred = credentials.Certificate(service_account_key)
+
+    # Create the pool of database clients first, so a failure here leaves
+    # nothing behind and the next call can simply retry
+    db_pool = [
+        gcloud_firestore.Client(
+            project=service_account_key["project_id"],
+            credentials=cred.get_credential()
+        )
+        for _ in range(FS_POOL_SIZE)
+    ]
+
+    # Initialize Firebase, reusing the app if an earlier attempt registered it
+    try:
+        app = firebase_admin.get_app()
+    except ValueError:
+        app = firebase_admin.initialize_app(cred, {
+            'storageBucket': 'speak-sharp-6bd84.firebasestorage.app'
+        })
+
+    return app, db_pool
+
+def is_firebase_initialized():
+    """Check whether Firebase has been initialized successfully (failures aren't cached)"""
+    return _init_firebase.cache_info().currsize > 0
+
+def get_firebase_app():
+    """Return the Firebase app, initializing it if needed"""
+    return _init_firebase()[0]
+
+def get_db():
+    """Return the next Firestore client from the pool (round-robin)"""
+    return _init_firebase()[1][next(_next_client)]
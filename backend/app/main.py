@@ -1,13 +1,25 @@
 import os
-import whisper
-import librosa
+import asyncio
+import aiofiles
+import aiofiles.os
+import orjson
+import ctranslate2
+from faster_whisper import WhisperModel
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import tempfile
+import shutil
 import traceback
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, and no multi-worker server either
+    fcntl = None
+
 # Import all our ML models
 from app.models import (
     filler_word_detection,
@@ -19,8 +31,12 @@ from app.models import (
     vocabulary_evaluation
 )
 
+from app.utils.cache import AnalysisCache
+from app.services.firestore_batcher import FirestoreBatcher
+
 # Import Firebase
-from app.firebase_config import db
+from firebase_admin import firestore
+from app.firebase_config import get_db, is_firebase_initialized
 
 # Load environment variables
 load_dotenv()
@@ -29,7 +45,8 @@ load_dotenv()
 app = FastAPI(
     title="Speak Sharp API",
     description="Speech analysis and feedback API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson is much faster on the large analysis payloads
 )
 
 # Configure CORS (allows Flutter app to call this API)
@@ -41,21 +58,154 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global variable for Whisper model
+# Global variable for Whisper model (each server worker process loads its own copy)
 whisper_model = None
+WHISPER_MODEL_NAME = "base"
+WHISPER_GPU_COUNT = ctranslate2.get_cuda_device_count()
+WHISPER_DEVICE = "cuda" if WHISPER_GPU_COUNT > 0 else "cpu"
+# INT8 weights with FP16 activations on GPU, plain INT8 on CPU
+WHISPER_COMPUTE_TYPE = "int8_float16" if WHISPER_DEVICE == "cuda" else "int8"
+# Speech chunks decoded per GPU call; batching doesn't help on CPU
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8" if WHISPER_DEVICE == "cuda" else "1"))
+
+# Worker processes take this lock in turn while loading Whisper, so they
+# don't all allocate GPU memory / CUDA contexts at the same moment
+WHISPER_LOCK_PATH = os.getenv("WHISPER_LOCK_PATH", os.path.join(tempfile.gettempdir(), "whisper.lock"))
+
+# Thread pool for the blocking ML work (Whisper, librosa, parselmouth)
+# so the event loop can keep serving other requests while one is analyzed.
+# Cores are split between worker processes when running several of them.
+# WEB_CONCURRENCY is only a hint (the Procfiles and README set it, gunicorn -w
+# doesn't), so ANALYSIS_THREADS sets the pool size per worker explicitly
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+ANALYSIS_THREADS = int(os.getenv(
+    "ANALYSIS_THREADS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+))
+EXECUTOR = ThreadPoolExecutor(max_workers=ANALYSIS_THREADS)
+
+# Whisper shares one model instance, so concurrent transcriptions only fight
+# over the same CPU/GPU. Requests queue here instead (raise if VRAM allows)
+WHISPER_SEM = asyncio.Semaphore(int(os.getenv("WHISPER_CONCURRENCY", "1")))
+
+# Analysis pipeline: /analyze jobs flow transcribe -> evaluate -> score,
+# with a few workers per stage so different requests' stages overlap
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+TRANSCRIBE_QUEUE = asyncio.Queue()
+EVALUATE_QUEUE = asyncio.Queue()
+SCORE_QUEUE = asyncio.Queue()
+pipeline_tasks = []
+
+# Transcription, duration and filler results for recently seen audio,
+# so retries of the same upload skip Whisper entirely
+TRANSCRIPTION_CACHE = AnalysisCache(max_entries=128)
+
+# Uploads are copied to disk 1 MiB at a time
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Small uploads are saved to RAM-backed /dev/shm (when available) so the
+# decoder reads them from memory instead of disk
+IN_MEMORY_UPLOAD_LIMIT = 32 * 1024 * 1024
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+@contextmanager
+def whisper_load_lock():
+    """
+    Hold the Whisper load lock, so worker processes load one at a time.
+    
+    The worker count isn't known reliably here (gunicorn -w doesn't set
+    WEB_CONCURRENCY), so the lock is always taken; it's free when
+    uncontended. Skipped only where fcntl isn't available (Windows).
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    with open(WHISPER_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+# Shared by /save-speech so concurrent saves go out in one batch commit;
+# created on first use, as Firebase itself is
+speech_batcher = None
+
+def get_speech_batcher():
+    """Return the Firestore write batcher, creating it on first use"""
+    global speech_batcher
+    if speech_batcher is None:
+        speech_batcher = FirestoreBatcher(get_db())
+    return speech_batcher
+
+def load_whisper_model():
+    """
+    Load the Whisper model, one server worker process at a time.
+    
+    With several GPUs, workers are spread across them by process ID.
+    
+    Returns:
+        faster_whisper.WhisperModel instance
+    """
+    device_index = os.getpid() % WHISPER_GPU_COUNT if WHISPER_DEVICE == "cuda" else 0
+    
+    with whisper_load_lock():
+        print(f"Loading Whisper model on {WHISPER_DEVICE}:{device_index} (pid {os.getpid()})...")
+        return WhisperModel(
+            WHISPER_MODEL_NAME,
+            device=WHISPER_DEVICE,
+            device_index=device_index,
+            compute_type=WHISPER_COMPUTE_TYPE,
+            num_workers=2          # Lets two transcriptions run at once when WHISPER_CONCURRENCY > 1
+        )
 
 @app.on_event("startup")
 async def startup_event():
-    """Load Whisper model when server starts"""
+    """
+    Load Whisper model when server starts.
+    
+    Runs once per worker process, so every worker gets its own model
+    (loads are serialized across workers with a file lock).
+    Don't start gunicorn with --preload, or workers would share a forked copy.
+    """
     global whisper_model
-    print("Loading Whisper model...")
     try:
-        # Load Whisper base model (good balance of speed and accuracy)
-        whisper_model = whisper.load_model("base")
-        print("Whisper model loaded successfully!")
+        # Load Whisper base model (good balance of speed and accuracy).
+        # Waiting for the load lock blocks, so do it off the event loop
+        whisper_model = await asyncio.get_running_loop().run_in_executor(
+            EXECUTOR, load_whisper_model
+        )
+        print(f"Whisper model loaded successfully on {WHISPER_DEVICE} ({WHISPER_COMPUTE_TYPE})!")
+        
+        # Warm up with one second of silence so model weights are paged in and
+        # CUDA kernels are initialized now rather than on the first request
+        print("Warming up Whisper model...")
+        await asyncio.get_running_loop().run_in_executor(
+            EXECUTOR, transcript.warm_up, whisper_model, WHISPER_BATCH_SIZE
+        )
+        print("Whisper warm-up complete")
     except Exception as e:
         print(f"Error loading Whisper model: {e}")
         raise
+    
+    # Start the analysis pipeline workers
+    pipeline_stages = [
+        (transcription_stage, TRANSCRIBE_QUEUE, EVALUATE_QUEUE),
+        (evaluation_stage, EVALUATE_QUEUE, SCORE_QUEUE),
+        (scoring_stage, SCORE_QUEUE, None)
+    ]
+    for stage, inbox, outbox in pipeline_stages:
+        for _ in range(PIPELINE_WORKERS):
+            pipeline_tasks.append(asyncio.create_task(pipeline_worker(stage, inbox, outbox)))
+    print(f"Analysis pipeline started ({PIPELINE_WORKERS} workers per stage)")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the analysis pipeline workers"""
+    for task in pipeline_tasks:
+        task.cancel()
+    await asyncio.gather(*pipeline_tasks, return_exceptions=True)
+    pipeline_tasks.clear()
 
 @app.get("/")
 async def root():
@@ -75,8 +225,295 @@ async def health_check():
     return {
         "status": "healthy",
         "whisper_model_loaded": whisper_model is not None,
-        "firebase_connected": True  # Assumes firebase_config.py ran successfully
+        "firebase_connected": is_firebase_initialized()  # False until the first Firebase call succeeds
+    }
+
+async def run_transcription_steps(y, sr):
+    """
+    Steps 1-4 of the analysis: transcription, duration, filler words and pauses.
+    
+    Args:
+        y: Decoded mono audio samples (from transcript.load_audio)
+        sr: Sample rate of y
+        
+    Returns:
+        Dictionary with the intermediate results used by the scoring steps
+    """
+    loop = asyncio.get_running_loop()
+    
+    async def transcribe():
+        whisper_audio = await loop.run_in_executor(EXECUTOR, transcript.to_whisper_input, y, sr)
+        async with WHISPER_SEM:
+            return await loop.run_in_executor(
+                EXECUTOR, transcript.transcribe_audio, whisper_model, whisper_audio, WHISPER_BATCH_SIZE
+            )
+    
+    # === STEP 1: TRANSCRIPTION ===
+    print("\nStep 1: Transcribing audio...")
+    transcription_result = await transcribe()
+    transcription_with_pauses, number_of_pauses = transcript.process_transcription(transcription_result)
+    print(f"Transcription complete. Found {number_of_pauses} pauses.")
+    
+    # === STEP 2: GET AUDIO DURATION ===
+    actual_duration = len(y) / sr
+    actual_duration_str = f"{int(actual_duration // 60)}:{int(actual_duration % 60):02d}"
+    print(f" Duration: {actual_duration_str} ({actual_duration:.1f} seconds)")
+    
+    # === STEPS 3-4: FILLER WORD + PAUSE ANALYSIS (in parallel) ===
+    print("\nSteps 3-4: Analyzing filler words and pauses...")
+    filler_analysis, pause_analysis = await asyncio.gather(
+        loop.run_in_executor(
+            EXECUTOR, filler_word_detection.analyze_filler_words, transcription_result
+        ),
+        loop.run_in_executor(
+            EXECUTOR, filler_word_detection.analyze_mid_sentence_pauses, transcription_with_pauses
+        )
+    )
+    print(f"Found {filler_analysis['Total Filler Words']} filler words")
+    print(f"Pause analysis complete")
+    
+    return {
+        "transcription_result": transcription_result,
+        "transcription_with_pauses": transcription_with_pauses,
+        "number_of_pauses": number_of_pauses,
+        "actual_duration": actual_duration,
+        "actual_duration_str": actual_duration_str,
+        "filler_analysis": filler_analysis,
+        "pause_analysis": pause_analysis
+    }
+
+class AnalysisJob:
+    """
+    One /analyze request travelling through the pipeline stages.
+    
+    Each stage stores its output in `data`; the scoring stage resolves `done`
+    with the response payload (or any stage resolves it with an exception).
+    """
+    
+    def __init__(self, audio_path, y, sr, cache_key, topic, expected_duration, user_id):
+        self.audio_path = audio_path
+        self.y = y
+        self.sr = sr
+        self.cache_key = cache_key
+        self.topic = topic
+        self.expected_duration = expected_duration
+        self.user_id = user_id
+        self.modulation_task = None
+        self.data = {}
+        self.done = asyncio.get_running_loop().create_future()
+
+async def transcription_stage(job):
+    """Pipeline stage 1: steps 1-4 (cached per audio content)"""
+    # These only depend on the audio, so identical uploads reuse the result
+    if job.cache_key in TRANSCRIPTION_CACHE:
+        print("\nSteps 1-4: Reusing cached transcription for identical audio")
+    speech_data = await TRANSCRIPTION_CACHE.get_or_compute(
+        job.cache_key, lambda: run_transcription_steps(job.y, job.sr)
+    )
+    job.data.update(speech_data)
+
+async def evaluation_stage(job):
+    """Pipeline stage 2: steps 5-9, the per-category evaluations"""
+    loop = asyncio.get_running_loop()
+    data = job.data
+    
+    # === STEP 5: PROFICIENCY SCORE ===
+    print("\nStep 5: Calculating proficiency score...")
+    data['proficiency_result'] = proficiency_evaluation.calculate_proficiency_score(
+        data['filler_analysis'],
+        data['pause_analysis'],
+        data['actual_duration_str'],
+        job.expected_duration
+    )
+    print(f"Proficiency score: {data['proficiency_result']['final_score']}/20")
+    
+    # === STEPS 7-9: DEVELOPMENT, EFFECTIVENESS, VOCABULARY (in parallel) ===
+    print("\nSteps 7-9: Evaluating development, effectiveness and vocabulary...")
+    (
+        data['development_result'],
+        data['effectiveness_result'],
+        data['vocabulary_result'],
+        data['modulation_result']
+    ) = await asyncio.gather(
+        loop.run_in_executor(
+            EXECUTOR,
+            speech_development.evaluate_speech_development,
+            data['transcription_with_pauses'],
+            data['actual_duration'],
+            job.expected_duration
+        ),
+        loop.run_in_executor(
+            EXECUTOR,
+            speech_effectiveness.evaluate_speech_effectiveness,
+            data['transcription_with_pauses'],
+            job.topic,
+            job.expected_duration,
+            data['actual_duration']
+        ),
+        loop.run_in_executor(
+            EXECUTOR,
+            vocabulary_evaluation.evaluate_speech,
+            data['transcription_result'],
+            data['transcription_with_pauses'],
+            job.audio_path,
+            job.topic
+        ),
+        job.modulation_task
+    )
+
+async def scoring_stage(job):
+    """Pipeline stage 3: steps 10-11, overall score and the response payload"""
+    data = job.data
+    proficiency_result = data['proficiency_result']
+    modulation_result = data['modulation_result']
+    development_result = data['development_result']
+    effectiveness_result = data['effectiveness_result']
+    vocabulary_result = data['vocabulary_result']
+    filler_analysis = data['filler_analysis']
+    actual_duration = data['actual_duration']
+    
+    if 'error' in modulation_result:
+        print(f"Voice modulation error: {modulation_result['error']}")
+        modulation_score = 10.0  # Default score
+    else:
+        modulation_score = modulation_result['scores']['total_score']
+        print(f"Voice modulation score: {modulation_score}/20")
+    
+    development_score = development_result['structure']['score'] + development_result['time_utilization']['score']
+    print(f"Speech development score: {development_score}/20")
+    
+    effectiveness_score = effectiveness_result['total_score']
+    print(f"Speech effectiveness score: {effectiveness_score}/20")
+    
+    # Convert from 0-100 scale to 0-20 scale
+    vocabulary_score = (vocabulary_result['vocabulary_score'] / 100) * 20
+    print(f"Vocabulary score: {vocabulary_score}/20")
+    
+    # === STEP 10: CALCULATE OVERALL SCORE ===
+    print("\nStep 10: Calculating overall score...")
+    overall_score = (
+        proficiency_result['final_score'] +
+        modulation_score +
+        development_score +
+        effectiveness_score +
+        vocabulary_score
+    )
+    print(f"Overall score: {overall_score}/100")
+    
+    # === STEP 11: COMPILE RESULTS ===
+    print("\n Step 11: Compiling results...")
+    
+    results = {
+        "overall_score": round(overall_score, 1),
+        "scores": {
+            "proficiency": round(proficiency_result['final_score'], 1),
+            "voice_modulation": round(modulation_score, 1),
+            "speech_development": round(development_score, 1),
+            "speech_effectiveness": round(effectiveness_score, 1),
+            "vocabulary": round(vocabulary_score, 1)
+        },
+        "transcription": data['transcription_with_pauses'],
+        "duration": {
+            "actual": data['actual_duration_str'],
+            "expected": job.expected_duration,
+            "seconds": round(actual_duration, 1)
+        },
+        "filler_analysis": {
+            "total_filler_words": filler_analysis['Total Filler Words'],
+            "filler_density": round(filler_analysis['Filler Density'], 3),
+            "filler_per_minute": filler_analysis['Filler Words Per Minute']
+        },
+        "pause_analysis": data['pause_analysis'],
+        "proficiency_details": proficiency_result,
+        "voice_modulation_details": modulation_result if 'error' not in modulation_result else {},
+        "speech_development_details": development_result,
+        "speech_effectiveness_details": effectiveness_result,
+        "vocabulary_details": {
+            "lexical_diversity": vocabulary_result.get('lexical_diversity', 0),
+            "unique_words": vocabulary_result.get('unique_words', 0),
+            "advanced_vocab_count": vocabulary_result.get('advanced_vocab_count', 0),
+            "feedback": vocabulary_result.get('feedback', [])
+        },
+        "topic": job.topic,
+        "user_id": job.user_id
     }
+    
+    job.done.set_result(results)
+
+async def pipeline_worker(stage, inbox, outbox=None):
+    """
+    Run one stage of the analysis pipeline forever.
+    
+    Pulls jobs from inbox, runs the stage and passes the job on to outbox,
+    so a later stage of one request overlaps an earlier stage of the next.
+    """
+    while True:
+        job = await inbox.get()
+        try:
+            # Skip jobs that already failed or whose client went away
+            if not job.done.done():
+                await stage(job)
+                if outbox is not None:
+                    await outbox.put(job)
+        except Exception as e:
+            if not job.done.done():
+                job.done.set_exception(e)
+        finally:
+            inbox.task_done()
+
+def upload_temp_dir(size):
+    """
+    Pick where to save an upload: /dev/shm when it's small enough and fits
+    in the space left there, otherwise the default temp directory (None).
+    """
+    if SHM_DIR is None or size is None or size > IN_MEMORY_UPLOAD_LIMIT:
+        return None
+    # Keep headroom for other requests' uploads landing at the same time
+    if shutil.disk_usage(SHM_DIR).free < 2 * size:
+        return None
+    return SHM_DIR
+
+async def write_upload(audio: UploadFile, suffix: str, temp_dir):
+    """
+    Stream an upload into a new temp file in chunks, hashing it on the way.
+    
+    Returns:
+        Tuple: (temp file path, content hash)
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=temp_dir) as temp_file:
+        temp_audio_path = temp_file.name
+    
+    content_hasher = TRANSCRIPTION_CACHE.new_hasher()
+    try:
+        async with aiofiles.open(temp_audio_path, 'wb') as out_file:
+            while chunk := await audio.read(UPLOAD_CHUNK_SIZE):
+                content_hasher.update(chunk)
+                await out_file.write(chunk)
+    except OSError:
+        await aiofiles.os.remove(temp_audio_path)
+        raise
+    
+    return temp_audio_path, content_hasher.hexdigest()
+
+async def save_upload(audio: UploadFile, suffix: str):
+    """
+    Save an upload to a temp file, preferring RAM-backed /dev/shm.
+    
+    /dev/shm can still fill up mid-write (Docker gives it 64 MB), in which
+    case the upload is rewritten to the default temp directory.
+    
+    Returns:
+        Tuple: (temp file path, content hash)
+    """
+    temp_dir = upload_temp_dir(audio.size)
+    try:
+        return await write_upload(audio, suffix, temp_dir)
+    except OSError as e:
+        if temp_dir is None:
+            raise
+        print(f"Could not save upload to {temp_dir} ({e}), using the default temp directory")
+        await audio.seek(0)
+        return await write_upload(audio, suffix, None)
 
 @app.post("/analyze")
 async def analyze_speech(
@@ -119,139 +556,37 @@ async def analyze_speech(
         print(f"Expected duration: {expected_duration}")
         print(f"{'='*50}\n")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            temp_audio_path = temp_file.name
-            content = await audio.read()
-            temp_file.write(content)
+        # Save uploaded file temporarily, streaming it in chunks so memory
+        # stays bounded and other requests keep running during the copy
+        temp_audio_path, content_hash = await save_upload(audio, file_ext)
         
         print(f"Audio file saved to: {temp_audio_path}")
         
-        # === STEP 1: TRANSCRIPTION ===
-        print("\nStep 1: Transcribing audio...")
-        transcription_result = transcript.transcribe_audio(whisper_model, temp_audio_path)
-        transcription_with_pauses, number_of_pauses = transcript.process_transcription(transcription_result)
-        print(f"Transcription complete. Found {number_of_pauses} pauses.")
+        loop = asyncio.get_running_loop()
         
-        # === STEP 2: GET AUDIO DURATION ===
-        print("\nStep 2: Getting audio duration...")
-        y, sr = librosa.load(temp_audio_path)
-        actual_duration = librosa.get_duration(y=y, sr=sr)
-        actual_duration_str = f"{int(actual_duration // 60)}:{int(actual_duration % 60):02d}"
-        print(f" Duration: {actual_duration_str} ({actual_duration:.1f} seconds)")
+        # Decode once; Whisper, duration and voice modulation share the samples
+        y, sr = await loop.run_in_executor(EXECUTOR, transcript.load_audio, temp_audio_path)
         
-        # === STEP 3: FILLER WORD ANALYSIS ===
-        print("\nStep 3: Analyzing filler words...")
-        filler_analysis = filler_word_detection.analyze_filler_words(transcription_result)
-        print(f"Found {filler_analysis['Total Filler Words']} filler words")
-        
-        # === STEP 4: PAUSE ANALYSIS ===
-        print("\nStep 4: Analyzing pauses...")
-        pause_analysis = filler_word_detection.analyze_mid_sentence_pauses(transcription_with_pauses)
-        print(f"Pause analysis complete")
-        
-        # === STEP 5: PROFICIENCY SCORE ===
-        print("\nStep 5: Calculating proficiency score...")
-        proficiency_result = proficiency_evaluation.calculate_proficiency_score(
-            filler_analysis,
-            pause_analysis,
-            actual_duration_str,
-            expected_duration
-        )
-        print(f"Proficiency score: {proficiency_result['final_score']}/20")
-        
-        # === STEP 6: VOICE MODULATION ===
-        print("\nStep 6: Analyzing voice modulation...")
-        modulation_result = voice_modulation.analyze_voice_modulation(temp_audio_path)
-        
-        if 'error' in modulation_result:
-            print(f"Voice modulation error: {modulation_result['error']}")
-            modulation_score = 10.0  # Default score
-        else:
-            modulation_score = modulation_result['scores']['total_score']
-            print(f"Voice modulation score: {modulation_score}/20")
-        
-        # === STEP 7: SPEECH DEVELOPMENT ===
-        print("\nStep 7: Evaluating speech development...")
-        development_result = speech_development.evaluate_speech_development(
-            transcription_with_pauses,
-            actual_duration,
-            expected_duration
+        job = AnalysisJob(
+            audio_path=temp_audio_path,
+            y=y,
+            sr=sr,
+            cache_key=TRANSCRIPTION_CACHE.make_key(content_hash, WHISPER_MODEL_NAME),
+            topic=topic,
+            expected_duration=expected_duration,
+            user_id=user_id
         )
-        development_score = development_result['structure']['score'] + development_result['time_utilization']['score']
-        print(f"Speech development score: {development_score}/20")
         
-        # === STEP 8: SPEECH EFFECTIVENESS ===
-        print("\nStep 8: Evaluating speech effectiveness...")
-        effectiveness_result = speech_effectiveness.evaluate_speech_effectiveness(
-            transcription_with_pauses,
-            topic,
-            expected_duration,
-            actual_duration
+        # === STEP 6: VOICE MODULATION (started early) ===
+        # Only needs the audio samples, so it runs while the job waits for transcription
+        print("\nStep 6: Analyzing voice modulation in the background...")
+        job.modulation_task = loop.run_in_executor(
+            EXECUTOR, voice_modulation.analyze_voice_modulation, temp_audio_path, y, sr
         )
-        effectiveness_score = effectiveness_result['total_score']
-        print(f"Speech effectiveness score: {effectiveness_score}/20")
         
-        # === STEP 9: VOCABULARY EVALUATION ===
-        print("\nStep 9: Evaluating vocabulary...")
-        vocabulary_result = vocabulary_evaluation.evaluate_speech(
-            transcription_result,
-            transcription_with_pauses,
-            temp_audio_path,
-            topic
-        )
-        # Convert from 0-100 scale to 0-20 scale
-        vocabulary_score = (vocabulary_result['vocabulary_score'] / 100) * 20
-        print(f"Vocabulary score: {vocabulary_score}/20")
-        
-        # === STEP 10: CALCULATE OVERALL SCORE ===
-        print("\nStep 10: Calculating overall score...")
-        overall_score = (
-            proficiency_result['final_score'] +
-            modulation_score +
-            development_score +
-            effectiveness_score +
-            vocabulary_score
-        )
-        print(f"Overall score: {overall_score}/100")
-        
-        # === STEP 11: COMPILE RESULTS ===
-        print("\n Step 11: Compiling results...")
-        
-        results = {
-            "overall_score": round(overall_score, 1),
-            "scores": {
-                "proficiency": round(proficiency_result['final_score'], 1),
-                "voice_modulation": round(modulation_score, 1),
-                "speech_development": round(development_score, 1),
-                "speech_effectiveness": round(effectiveness_score, 1),
-                "vocabulary": round(vocabulary_score, 1)
-            },
-            "transcription": transcription_with_pauses,
-            "duration": {
-                "actual": actual_duration_str,
-                "expected": expected_duration,
-                "seconds": round(actual_duration, 1)
-            },
-            "filler_analysis": {
-                "total_filler_words": filler_analysis['Total Filler Words'],
-                "filler_density": round(filler_analysis['Filler Density'], 3),
-                "filler_per_minute": filler_analysis['Filler Words Per Minute']
-            },
-            "pause_analysis": pause_analysis,
-            "proficiency_details": proficiency_result,
-            "voice_modulation_details": modulation_result if 'error' not in modulation_result else {},
-            "speech_development_details": development_result,
-            "speech_effectiveness_details": effectiveness_result,
-            "vocabulary_details": {
-                "lexical_diversity": vocabulary_result.get('lexical_diversity', 0),
-                "unique_words": vocabulary_result.get('unique_words', 0),
-                "advanced_vocab_count": vocabulary_result.get('advanced_vocab_count', 0),
-                "feedback": vocabulary_result.get('feedback', [])
-            },
-            "topic": topic,
-            "user_id": user_id
-        }
+        # Hand the job to the pipeline; the last stage resolves job.done
+        await TRANSCRIBE_QUEUE.put(job)
+        results = await job.done
         
         print(f"\n{'='*50}")
         print("ANALYSIS COMPLETE!")
@@ -260,12 +595,12 @@ async def analyze_speech(
         # === STEP 12: SAVE TO FIREBASE (OPTIONAL) ===
         # Uncomment if you want to save results to Firestore
         # try:
-        #     doc_ref = db.collection('speeches').add(results)
+        #     doc_ref = get_db().collection('speeches').add(results)
         #     print(f"Saved to Firebase with ID: {doc_ref[1].id}")
         # except Exception as e:
         #     print(f" Firebase save error: {e}")
         
-        return JSONResponse(content=results)
+        return results
         
     except Exception as e:
         # Log the full error
@@ -279,11 +614,13 @@ async def analyze_speech(
         )
         
     finally:
-        # Clean up temporary file
-        if temp_audio_path and os.path.exists(temp_audio_path):
+        # Clean up temporary file (off the event loop)
+        if temp_audio_path:
             try:
-                os.unlink(temp_audio_path)
+                await aiofiles.os.remove(temp_audio_path)
                 print(f"Cleaned up temporary file")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(f" Could not delete temp file: {e}")
 
@@ -303,12 +640,12 @@ async def save_speech_to_firebase(
         Success message with document ID
     """
     try:
-        import json
-        data = json.loads(speech_data)
+        data = orjson.loads(speech_data)
         
-        # Add to Firestore
-        doc_ref = db.collection('speeches').document()
-        doc_ref.set({
+        # Add to Firestore, batched with other requests' saves (commits run off the event loop)
+        batcher = get_speech_batcher()
+        doc_ref = batcher.db.collection('speeches').document()
+        await batcher.set(doc_ref, {
             'user_id': user_id,
             'timestamp': firestore.SERVER_TIMESTAMP,
             **data
@@ -327,5 +664,9 @@ async def save_speech_to_firebase(
         )
 
 if __name__ == "__main__":
+    # Development server. In production run several workers with gunicorn
+    # (it reads the worker count from WEB_CONCURRENCY):
+    #   export WEB_CONCURRENCY=4
+    #   gunicorn app.main:app -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, workers=WEB_CONCURRENCY)
\ No newline at end of file
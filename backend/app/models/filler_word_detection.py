@@ -1,4 +1,6 @@
 import re
+from bisect import bisect_right
+from collections import Counter
 
 # List of common filler words we want to detect
 FILLER_WORDS = {
@@ -7,6 +9,16 @@ FILLER_WORDS = {
     'kinda', 'gonna', 'wanna', 'i guess', 'so yeah'
 }
 
+# One compiled pattern for all fillers, scanned once over the whole transcript.
+# Whisper gives one word per token, so only single-word fillers can match a
+# word; each alternative must span a whole cleaned word, as the old
+# per-word set lookup did (so "like-minded" or "uh-huh" are not fillers)
+FILLER_RE = re.compile(
+    r'(?<!\S)(' + '|'.join(
+        re.escape(filler) for filler in sorted(FILLER_WORDS) if ' ' not in filler
+    ) + r')(?!\S)'
+)
+
 def clean_word(word):
     """Remove punctuation from a word and convert to lowercase"""
     # Remove punctuation like commas, periods, quotes
@@ -23,27 +35,34 @@ def analyze_filler_words(result):
     Returns:
         Dictionary with filler word analysis and score
     """
-    total_filler_words = 0
-    filler_words_per_minute = {}  # Track fillers by minute
-    total_words = 0
+    filler_words_per_minute = Counter()  # Track fillers by minute
     
-    # Loop through each segment (Whisper breaks audio into segments)
-    for segment in result['segments']:
-        # Get words with timestamps from this segment
-        for word_info in segment.get('words', []):
-            total_words += 1
-            word = clean_word(word_info['word'])
-            
-            # Check if this word is a filler word
-            if word in FILLER_WORDS:
-                timestamp = word_info['start']  # When the word was said
-                minute = int(timestamp // 60)   # Which minute (0, 1, 2, etc.)
-                total_filler_words += 1
-                
-                # Count fillers for this minute
-                if minute not in filler_words_per_minute:
-                    filler_words_per_minute[minute] = 0
-                filler_words_per_minute[minute] += 1
+    # Flatten all words (Whisper breaks audio into segments) into one cleaned
+    # string, remembering where each word starts so matches map back to timestamps
+    words = [word_info for segment in result['segments'] for word_info in segment.get('words', [])]
+    total_words = len(words)
+    
+    word_offsets = []
+    cleaned_words = []
+    offset = 0
+    for word_info in words:
+        word = clean_word(word_info['word'])
+        word_offsets.append(offset)
+        cleaned_words.append(word)
+        offset += len(word) + 1
+    text = ' '.join(cleaned_words)
+    
+    # Single pass over the transcript for every filler word
+    filler_counts = Counter()
+    for match in FILLER_RE.finditer(text):
+        filler_counts[match.group(1)] += 1
+        
+        word_info = words[bisect_right(word_offsets, match.start()) - 1]
+        timestamp = word_info['start']  # When the filler was said
+        minute = int(timestamp // 60)   # Which minute (0, 1, 2, etc.)
+        filler_words_per_minute[minute] += 1
+    
+    total_filler_words = sum(filler_counts.values())
 
     # Calculate filler word density (percentage)
     filler_density = total_filler_words / total_words if total_words > 0 else 0
@@ -79,6 +98,7 @@ def analyze_filler_words(result):
     # Return all the analysis
     return {
         'Total Filler Words': total_filler_words,
+        'Filler Word Counts': dict(filler_counts),
         'Filler Words Per Minute': minute_breakdown,
         'Filler Density': filler_density,
         'Score': round(score, 1)
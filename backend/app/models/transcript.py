@@ -1,22 +1,77 @@
 import re
+import librosa
+import numpy as np
+from faster_whisper import BatchedInferencePipeline
 
-def transcribe_audio(model, audio_path):
+# Whisper works on 16 kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+# Uploads are decoded at librosa's default rate, which the voice modulation
+# scores were tuned on, and resampled down for Whisper
+ANALYSIS_SAMPLE_RATE = 22050
+
+def load_audio(audio_path):
     """
-    Transcribe audio file to text using Whisper AI.
+    Decode an audio file once for every analysis step.
+    
+    The same samples are reused for transcription, duration and voice
+    analysis, so the file doesn't have to be decoded again by each step.
     
     Args:
-        model: Whisper model instance (loaded earlier)
         audio_path: Path to audio file (.wav, .mp3, etc.)
         
+    Returns:
+        Tuple: (samples as float32 numpy array, sample rate), the same as
+        librosa.load(audio_path) gives
+    """
+    y, sr = librosa.load(audio_path, sr=ANALYSIS_SAMPLE_RATE, mono=True, dtype=np.float32)
+    return y, sr
+
+def to_whisper_input(y, sr):
+    """
+    Resample decoded audio to the 16 kHz Whisper expects.
+    
+    Args:
+        y: Mono float32 samples (e.g. from load_audio())
+        sr: Sample rate of y
+        
+    Returns:
+        16 kHz mono float32 samples
+    """
+    if sr == WHISPER_SAMPLE_RATE:
+        return y
+    return librosa.resample(y, orig_sr=sr, target_sr=WHISPER_SAMPLE_RATE)
+
+def transcribe_audio(model, audio, batch_size=1):
+    """
+    Transcribe audio to text using Whisper AI (faster-whisper / CTranslate2).
+    
+    Args:
+        model: faster_whisper.WhisperModel instance (loaded earlier)
+        audio: Path to audio file (.wav, .mp3, etc.) or 16 kHz mono
+               float32 samples from to_whisper_input()
+        batch_size: Number of speech chunks decoded per model call. Above 1,
+                    the audio is split on silence and the chunks are decoded
+                    in batches (much faster on GPU)
+        
     Returns:
         Dictionary with transcription, timestamps, and segments
+        (same layout as openai-whisper's transcribe() result)
     """
     print("Transcribing audio...")
     
     # Call Whisper to transcribe
-    result = model.transcribe(
-        audio_path,
-        fp16=False,                    # Don't use 16-bit precision (more accurate)
+    transcriber = model
+    batch_options = {}
+    if batch_size > 1:
+        transcriber = BatchedInferencePipeline(model=model)
+        batch_options = {'batch_size': batch_size}
+    
+    segments, info = transcriber.transcribe(
+        audio,
+        **batch_options,
+        beam_size=5,
+        vad_filter=True,               # Skip silence (timestamps stay relative to the full audio)
         word_timestamps=True,          # Get timestamp for EACH word
         initial_prompt=(
             "Please transcribe exactly as spoken. Include every um, uh, ah, er, pause, "
@@ -25,7 +80,48 @@ def transcribe_audio(model, audio_path):
         )
     )
     
-    return result
+    # Segments are generated lazily; decoding happens while we consume them
+    result_segments = []
+    for segment in segments:
+        result_segments.append({
+            'id': segment.id,
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text,
+            'words': [
+                {
+                    'word': word.word,
+                    'start': word.start,
+                    'end': word.end,
+                    'probability': word.probability
+                }
+                for word in (segment.words or [])
+            ]
+        })
+    
+    return {
+        'text': ''.join(segment['text'] for segment in result_segments),
+        'segments': result_segments,
+        'language': info.language
+    }
+
+def warm_up(model, batch_size=1):
+    """
+    Run one second of silence through the model so weights are paged in and
+    kernels are initialized before the first real request.
+    
+    Args:
+        model: faster_whisper.WhisperModel instance
+        batch_size: Batch size real requests use (see transcribe_audio)
+    """
+    silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+    # Same path as real requests, so the Silero VAD model is loaded and the
+    # batched pipeline set up now
+    transcribe_audio(model, silence, batch_size)
+    # VAD filters out the silence above without decoding anything, so also
+    # decode it with VAD off to initialize the decoder and word alignment
+    segments, _ = model.transcribe(silence, vad_filter=False, word_timestamps=True)
+    list(segments)
 
 def process_transcription(result):
     """
@@ -6,21 +6,27 @@ import parselmouth
 from parselmouth.praat import call
 import statistics
 
-def analyze_voice_modulation(audio_path):
+def analyze_voice_modulation(audio_path, y=None, sr=None):
     """
     Analyze voice modulation: pitch, volume, and emphasis.
     
     Args:
         audio_path: Path to audio file
+        y: Already decoded audio samples, as librosa.load(audio_path) gives
+           (optional, skips decoding the file again)
+        sr: Sample rate of y
         
     Returns:
         Dictionary with pitch analysis, volume analysis, emphasis, and scores
     """
     try:
-        # Load audio file with librosa (for general audio processing)
-        y, sr = librosa.load(audio_path)
+        if y is None:
+            # Load audio file with librosa (for general audio processing)
+            y, sr = librosa.load(audio_path)
         
-        # Load audio with parselmouth (specialized for voice analysis)
+        # Load audio with parselmouth (specialized for voice analysis).
+        # Praat reads the file at its native sample rate, which the pitch
+        # and intensity scores depend on, so it isn't built from y
         sound = parselmouth.Sound(audio_path)
         
         # === PITCH ANALYSIS ===
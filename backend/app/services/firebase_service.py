@@ -4,6 +4,7 @@ Handles all Firebase operations including file uploads and database operations
 """
 
 import os
+import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import firebase_admin
@@ -12,11 +13,11 @@ from pathlib import Path
 
 from app.core.config import get_settings
 from app.utils.logger import get_logger
+from app.services.firestore_batcher import FirestoreBatcher
 
 settings = get_settings()
 logger = get_logger(__name__)
 
-
 class FirebaseService:
     """Firebase integration service"""
     
@@ -27,6 +28,7 @@ class FirebaseService:
         
         self.db = firestore.client()
         self.bucket = storage.bucket()
+        self.batcher = FirestoreBatcher(self.db)
         logger.info("✅ Firebase Service initialized")
     
     def _initialize_firebase(self):
@@ -84,12 +86,12 @@ class FirebaseService:
             file_ext = Path(filename).suffix
             storage_path = f"speeches/{user_id}/{timestamp}{file_ext}"
             
-            # Upload file
+            # Upload file (the slowest blocking call here, so run it off the event loop)
             blob = self.bucket.blob(storage_path)
-            blob.upload_from_filename(file_path)
+            await asyncio.to_thread(blob.upload_from_filename, file_path)
             
             # Make publicly accessible
-            blob.make_public()
+            await asyncio.to_thread(blob.make_public)
             
             logger.info(f"☁️ File uploaded to: {storage_path}")
             return blob.public_url
@@ -145,10 +147,10 @@ class FirebaseService:
                 'feedback': analysis_data.get('feedback', {})
             }
             
-            # Save to Firestore
+            # Save to Firestore (committed together with other pending writes)
             user_ref = self.db.collection('users').document(user_id)
             speech_ref = user_ref.collection('speeches').document()
-            speech_ref.set(doc_data)
+            await self.batcher.set(speech_ref, doc_data)
             
             # Update user statistics
             await self._update_user_stats(user_id, analysis_data['overall_score'])
@@ -164,7 +166,7 @@ class FirebaseService:
         """Update user statistics after new speech"""
         try:
             user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
+            user_doc = await asyncio.to_thread(user_ref.get)
             
             if user_doc.exists:
                 data = user_doc.to_dict()
@@ -175,7 +177,7 @@ class FirebaseService:
                 new_total = total_speeches + 1
                 new_avg = ((current_avg * total_speeches) + new_score) / new_total
                 
-                user_ref.update({
+                await asyncio.to_thread(user_ref.update, {
                     'totalSpeeches': new_total,
                     'averageScore': round(new_avg, 2),
                     'lastSpeechDate': firestore.SERVER_TIMESTAMP
@@ -201,7 +203,7 @@ class FirebaseService:
                 .limit(limit)
             )
             
-            docs = speeches_ref.stream()
+            docs = await asyncio.to_thread(lambda: list(speeches_ref.stream()))
             speeches = []
             
             for doc in docs:
@@ -219,7 +221,7 @@ class FirebaseService:
         """Get user's overall statistics"""
         try:
             user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
+            user_doc = await asyncio.to_thread(user_ref.get)
             
             if not user_doc.exists:
                 return {
@@ -0,0 +1,123 @@
+"""
+Firestore write batching
+Coalesces concurrent document writes into shared batch commits
+"""
+
+import asyncio
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque, Tuple
+from google.api_core import exceptions as gcp_exceptions
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Commit errors worth retrying with backoff
+RETRYABLE_COMMIT_ERRORS = (
+    gcp_exceptions.Aborted,
+    gcp_exceptions.Conflict,
+    gcp_exceptions.DeadlineExceeded,
+    gcp_exceptions.ServiceUnavailable,
+)
+
+
+class FirestoreBatcher:
+    """
+    Coalesces Firestore document writes into batched commits.
+    
+    Writes queued within a short window (or until the batch is full) are
+    sent in a single db.batch() commit on a worker thread, so concurrent
+    requests share one round-trip instead of each doing their own.
+    """
+    
+    # Firestore allows 500 writes per batch; stay well below it
+    MAX_BATCH_SIZE = 400
+    
+    def __init__(self, db, window: float = 0.1, max_retries: int = 3):
+        self.db = db
+        self.window = window
+        self.max_retries = max_retries
+        self._pending: Deque[Tuple[Any, Dict[str, Any], asyncio.Future]] = deque()
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def set(self, doc_ref, data: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a document write
+        
+        Returns:
+            Future that resolves once the write has been committed
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((doc_ref, data, future))
+        
+        if len(self._pending) >= self.MAX_BATCH_SIZE:
+            self._flush_task = loop.create_task(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_after_window())
+        
+        return future
+    
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window)
+        await self.flush()
+    
+    async def flush(self):
+        """Commit everything queued so far"""
+        while self._pending:
+            count = min(len(self._pending), self.MAX_BATCH_SIZE)
+            writes = [self._pending.popleft() for _ in range(count)]
+            
+            try:
+                await self._commit(writes)
+            except RETRYABLE_COMMIT_ERRORS as e:
+                # Still failing after the retries: Firestore itself is in trouble
+                logger.error(f"Failed to commit batch of {len(writes)} writes: {str(e)}")
+                self._resolve(writes, e)
+            except Exception as e:
+                # A batch is all-or-nothing, so one bad document (invalid or
+                # too large) fails everyone's writes. Commit them one by one
+                # so the error only reaches the request that caused it
+                if len(writes) == 1:
+                    logger.error(f"Failed to commit write: {str(e)}")
+                    self._resolve(writes, e)
+                    continue
+                logger.warning(f"Batch of {len(writes)} writes failed ({str(e)}), committing them one by one")
+                for write in writes:
+                    try:
+                        await self._commit([write])
+                    except Exception as write_error:
+                        logger.error(f"Failed to commit write: {str(write_error)}")
+                        self._resolve([write], write_error)
+                    else:
+                        self._resolve([write])
+            else:
+                self._resolve(writes)
+    
+    @staticmethod
+    def _resolve(writes: List[Tuple[Any, Dict[str, Any], asyncio.Future]], error: Optional[Exception] = None):
+        """Complete the futures of committed (or failed) writes"""
+        for _, _, future in writes:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+    
+    async def _commit(self, writes: List[Tuple[Any, Dict[str, Any], asyncio.Future]]):
+        """Commit writes in one batch, retrying transient errors with backoff"""
+        for attempt in range(self.max_retries + 1):
+            batch = self.db.batch()
+            for doc_ref, data, _ in writes:
+                batch.set(doc_ref, data)
+            
+            try:
+                await asyncio.to_thread(batch.commit)
+                return
+            except RETRYABLE_COMMIT_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = 0.1 * (2 ** attempt)
+                logger.warning(f"Batch commit failed ({str(e)}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
@@ -0,0 +1,117 @@
+"""
+In-memory caches for VocalLabs
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class AnalysisCache:
+    """
+    LRU cache for analysis results keyed on audio content.
+    Concurrent requests for the same key share a single computation.
+    Entries optionally expire after ttl seconds.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (value, expiry time or None)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    @staticmethod
+    def new_hasher():
+        """Hasher for audio content, fed incrementally while an upload is streamed"""
+        return hashlib.blake2b(digest_size=16)
+
+    @staticmethod
+    def make_key(content_hash: str, model_name: str) -> Tuple[str, str]:
+        """Build a cache key from the audio content hash and the model that processes it"""
+        return content_hash, model_name
+
+    def _is_fresh(self, key: Hashable) -> bool:
+        """Check the key is cached and not expired (expired entries are dropped)"""
+        if key not in self._entries:
+            return False
+        _, expires_at = self._entries[key]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._is_fresh(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used"""
+        if not self._is_fresh(key):
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """
+        Drop every entry whose key matches predicate.
+
+        Computations already running for a matching key may have read the
+        old data, so their results are no longer stored, and later callers
+        start a fresh computation instead of waiting on them.
+        """
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+        for key in [key for key in self._in_flight if predicate(key)]:
+            del self._in_flight[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for key, computing it on a miss.
+
+        If the same key is already being computed, wait for that result
+        instead of starting a second computation. The computation runs in
+        its own task, so a cancelled caller doesn't cancel it for the others.
+        """
+        if self._is_fresh(key):
+            return self.get(key)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = await compute()
+        # Only store the result if the key wasn't invalidated meanwhile
+        if self._in_flight.get(key) is asyncio.current_task():
+            self.set(key, value)
+        return value
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved when every caller has gone
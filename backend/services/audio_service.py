@@ -8,12 +8,14 @@ import shutil
 from pathlib import Path
 from typing import Optional
 import aiofiles
+import aiofiles.os
 from fastapi import UploadFile
 import librosa
 import soundfile as sf
 
 from utils.logger import setup_logger
 from utils.exceptions import AudioProcessingError
+from utils.cache import AnalysisCache
 from config.settings import settings
 
 logger = setup_logger(__name__)
@@ -56,10 +58,10 @@ class AudioProcessingService:
             filename = f"{user_id}_{os.urandom(8).hex()}.{file.filename.split('.')[-1]}"
             filepath = user_dir / filename
             
-            # Save file
+            # Save file in 1 MiB chunks so large uploads don't sit in memory
             async with aiofiles.open(filepath, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+                while chunk := await file.read(1024 * 1024):
+                    await f.write(chunk)
             
             logger.info(f"✅ Audio saved: {filepath}")
             
@@ -75,12 +77,32 @@ class AudioProcessingService:
     async def _validate_audio(self, filepath: str):
         """Validate audio file can be loaded"""
         try:
+            # Header-only check for formats libsndfile understands (wav, flac, ogg, mp3)
+            try:
+                info = sf.info(filepath)
+            except RuntimeError:
+                info = None
+            
+            if info is not None:
+                if info.frames == 0:
+                    raise AudioProcessingError("Audio file is empty or corrupted")
+                return
+            
+            # Other formats (e.g. m4a) need an actual decode
             audio, sr = librosa.load(filepath, sr=None, duration=1)
             if len(audio) == 0:
                 raise AudioProcessingError("Audio file is empty or corrupted")
         except Exception as e:
             raise AudioProcessingError(f"Invalid audio file: {str(e)}")
     
+    async def content_digest(self, filepath: str) -> str:
+        """Hash audio file contents (used as a cache key for repeated uploads)"""
+        digest = AnalysisCache.new_hasher()
+        async with aiofiles.open(filepath, 'rb') as f:
+            while chunk := await f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
     async def convert_to_wav(self, filepath: str) -> str:
         """Convert audio to WAV format if needed"""
         if filepath.endswith('.wav'):
@@ -101,9 +123,10 @@ class AudioProcessingService:
     async def cleanup_file(self, filepath: str):
         """Delete audio file"""
         try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                logger.info(f"🗑️  Cleaned up: {filepath}")
+            await aiofiles.os.remove(filepath)
+            logger.info(f"🗑️  Cleaned up: {filepath}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to cleanup file: {e}")
     
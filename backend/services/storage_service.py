@@ -5,6 +5,7 @@ Handles data persistence using Firebase Firestore
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import asyncio
 import uuid
 
 from firebase_admin import credentials, firestore, initialize_app
@@ -63,7 +64,8 @@ class StorageService:
         self,
         user_id: str,
         speech_title: Optional[str],
-        results: Dict[str, Any]
+        results: Dict[str, Any],
+        analysis_id: Optional[str] = None
     ) -> str:
         """
         Save analysis results to Firestore
@@ -72,12 +74,13 @@ class StorageService:
             user_id: User identifier
             speech_title: Optional speech title
             results: Analysis results
+            analysis_id: Pre-generated ID (a new one is created if omitted)
         
         Returns:
             Analysis ID
         """
         try:
-            analysis_id = str(uuid.uuid4())
+            analysis_id = analysis_id or str(uuid.uuid4())
             
             doc_data = {
                 "analysis_id": analysis_id,
@@ -87,18 +90,22 @@ class StorageService:
                 "scores": results.get("scores", {}),
                 "summary": results.get("summary", {}),
                 "metadata": results.get("metadata", {}),
-                "transcription_preview": results.get("transcription", "")[:500]  # First 500 chars
+                "transcription_preview": results.get("transcription", "")[:500],  # First 500 chars
+                "status": "saved"
             }
             
-            # Save main document
-            self.db.collection('analyses').document(analysis_id).set(doc_data)
+            doc_ref = self.db.collection('analyses').document(analysis_id)
             
-            # Save detailed analysis in subcollection
-            self.db.collection('analyses').document(analysis_id).collection('details').document('full').set({
+            # Save detailed analysis in subcollection first, so the main
+            # document only appears once the analysis is complete
+            await asyncio.to_thread(doc_ref.collection('details').document('full').set, {
                 "detailed_analysis": results.get("detailed_analysis", {}),
                 "full_transcription": results.get("transcription", "")
             })
             
+            # Save main document (Firestore calls block, so run them off the event loop)
+            await asyncio.to_thread(doc_ref.set, doc_data)
+            
             logger.info(f"✅ Analysis saved: {analysis_id}")
             
             return analysis_id
@@ -107,6 +114,36 @@ class StorageService:
             logger.error(f"❌ Failed to save analysis: {e}")
             raise StorageError(f"Failed to save analysis: {str(e)}")
     
+    async def mark_analysis_failed(
+        self,
+        analysis_id: str,
+        user_id: str,
+        error: str
+    ):
+        """
+        Record that saving an analysis failed
+        
+        Args:
+            analysis_id: Analysis identifier
+            user_id: User identifier
+            error: Why the save failed
+        """
+        try:
+            await asyncio.to_thread(
+                self.db.collection('analyses').document(analysis_id).set,
+                {
+                    "analysis_id": analysis_id,
+                    "user_id": user_id,
+                    "timestamp": datetime.now(),
+                    "status": "failed",
+                    "error": error
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to record failed save: {e}")
+            raise StorageError(f"Failed to record failed save: {str(e)}")
+    
     async def get_analysis(
         self,
         analysis_id: str,
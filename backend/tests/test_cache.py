@@ -0,0 +1,95 @@
+"""
+Tests for the in-memory analysis cache
+"""
+
+import asyncio
+import unittest
+
+from app.utils.cache import AnalysisCache
+
+
+class InvalidateTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_invalidated_in_flight_result_is_not_stored(self):
+        """A fetch that started before an invalidation must not cache old data"""
+        cache = AnalysisCache()
+        key = ("user-1", 20, 0)
+        release = asyncio.Event()
+
+        async def fetch_old():
+            await release.wait()
+            return "old page"
+
+        async def fetch_new():
+            return "new page"
+
+        stale_fetch = asyncio.create_task(cache.get_or_compute(key, fetch_old))
+        await asyncio.sleep(0)  # Fetch is now in flight
+
+        # The user saves or deletes an analysis while the fetch is running
+        cache.invalidate(lambda k: k[0] == "user-1")
+        release.set()
+
+        # The request that started first still gets its result...
+        self.assertEqual(await stale_fetch, "old page")
+        # ...but it isn't served to anyone after the invalidation
+        self.assertNotIn(key, cache)
+        self.assertEqual(await cache.get_or_compute(key, fetch_new), "new page")
+
+    async def test_callers_after_invalidation_do_not_join_stale_fetch(self):
+        cache = AnalysisCache()
+        key = ("user-1", 20, 0)
+        release = asyncio.Event()
+
+        async def fetch_old():
+            await release.wait()
+            return "old page"
+
+        async def fetch_new():
+            return "new page"
+
+        stale_fetch = asyncio.create_task(cache.get_or_compute(key, fetch_old))
+        await asyncio.sleep(0)
+        cache.invalidate(lambda k: k[0] == "user-1")
+
+        # Joining the stale fetch would wait forever, so bound the wait
+        fresh = await asyncio.wait_for(cache.get_or_compute(key, fetch_new), timeout=1)
+        self.assertEqual(fresh, "new page")
+        release.set()
+        await stale_fetch
+        self.assertEqual(cache.get(key), "new page")
+
+
+class SharedComputationTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Only the cancelled request fails; requests sharing its computation still get the result"""
+        cache = AnalysisCache()
+        key = ("audio-hash", "base")
+        release = asyncio.Event()
+        calls = 0
+
+        async def analyze():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        owner = asyncio.create_task(cache.get_or_compute(key, analyze))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute(key, analyze))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await asyncio.wait_for(waiter, timeout=1), "result")
+        with self.assertRaises(asyncio.CancelledError):
+            await owner
+        self.assertEqual(calls, 1)
+        self.assertEqual(cache.get(key), "result")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,20 @@ Main orchestrator for all speech analysis operations
 """
 
 import asyncio
+import os
+import tempfile
 import whisper
 import torch
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 from datetime import datetime
 import spacy
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock
+    fcntl = None
+
 from analyzers.transcription_analyzer import TranscriptionAnalyzer
 from analyzers.filler_word_analyzer import FillerWordAnalyzer
 from analyzers.pronunciation_analyzer import PronunciationAnalyzer
@@ -25,6 +33,29 @@ from config.settings import settings
 
 logger = setup_logger(__name__)
 
+# Worker processes take this lock in turn while loading Whisper, so they
+# don't all allocate GPU memory / CUDA contexts at the same moment
+WHISPER_LOCK_PATH = os.getenv("WHISPER_LOCK_PATH", os.path.join(tempfile.gettempdir(), "whisper.lock"))
+
+@contextmanager
+def whisper_load_lock():
+    """Hold the Whisper load lock (skipped where fcntl isn't available)"""
+    if fcntl is None:
+        yield
+        return
+    
+    with open(WHISPER_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def load_whisper_model(name: str):
+    """Load a Whisper model, one server worker process at a time"""
+    with whisper_load_lock():
+        return whisper.load_model(name)
+
 class SpeechAnalysisService:
     """
     Main service for comprehensive speech analysis
@@ -54,8 +85,8 @@ class SpeechAnalysisService:
         try:
             logger.info("⏳ Loading ML models...")
             
-            # Load Whisper model
-            self.whisper_model = whisper.load_model(settings.DEFAULT_MODEL)
+            # Load Whisper model (waiting for the load lock blocks, so do it off the event loop)
+            self.whisper_model = await asyncio.to_thread(load_whisper_model, settings.DEFAULT_MODEL)
             logger.info(f"✅ Whisper model '{settings.DEFAULT_MODEL}' loaded")
             
             # Load spaCy model